@@ -1,51 +1,9 @@
-from mltrace.client import (
-    clean_db,
-    create_component,
-    register,
-    backtrace,
-    get_history,
-    tag_component,
-    log_component_run,
-    create_random_ids,
-    get_component_information,
-    get_component_run_information,
-    web_trace,
-    get_recent_run_ids,
-    get_io_pointer,
-    set_db_uri,
-    get_db_uri,
-    get_git_hash,
-    get_git_tags,
-    set_address,
-    add_notes_to_component_run,
-    flag_output_id,
-    unflag_output_id,
-    review_flagged_outputs,
-    get_tags,
-    get_components,
-    unflag_all,
-    load,
-    save,
-    retract_label,
-    retrieve_retracted_labels,
-    retract_labels,
-    retrieve_io_pointers_for_label,
-    get_labels,
-    log_output,
-    log_feedback,
-    compute_metric,
-)
-from mltrace.entities import (
-    Component,
-    Test,
-    ComponentRun,
-    IOPointer,
-    Task,
-    supported_sklearn_metrics,
-    Metric,
-)
+"""Public API. Names are imported from their modules on first access
+(PEP 562), so importing mltrace doesn't pull in SQLAlchemy, git, or mlflow
+until they are needed."""
+import importlib
 
-__all__ = [
+_CLIENT_EXPORTS = [
     "clean_db",
     "create_component",
     "register",
@@ -71,10 +29,6 @@ __all__ = [
     "get_tags",
     "get_components",
     "unflag_all",
-    "Component",
-    "Test",
-    "ComponentRun",
-    "IOPointer",
     "load",
     "save",
     "retract_label",
@@ -85,7 +39,31 @@ __all__ = [
     "log_output",
     "log_feedback",
     "compute_metric",
+]
+_ENTITY_EXPORTS = [
+    "Component",
+    "Test",
+    "ComponentRun",
+    "IOPointer",
     "Task",
     "supported_sklearn_metrics",
     "Metric",
 ]
+_EXPORTS = {
+    **{name: "mltrace.client" for name in _CLIENT_EXPORTS},
+    **{name: "mltrace.entities" for name in _ENTITY_EXPORTS},
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,30 @@
+"""index_component_runs_outputs
+
+Revision ID: 9f3c2a1b7d4e
+Revises: 52750448d2da
+Create Date: 2026-10-15 10:12:41.318204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "9f3c2a1b7d4e"
+down_revision = "52750448d2da"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "component_runs_outputs_name_run_id",
+        "component_runs_outputs",
+        ["output_path_name", "component_run_id"],
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "component_runs_outputs_name_run_id",
+        table_name="component_runs_outputs",
+    )
@@ -226,6 +226,11 @@ component_run_output_association = Table(
         ["output_path_name", "output_path_value"],
         ["io_pointers.name", "io_pointers.value"],
     ),
+    Index(
+        "component_runs_outputs_name_run_id",
+        "output_path_name",
+        "component_run_id",
+    ),
 )
 
 component_run_dependencies = Table(
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 from git.index import typ
@@ -12,6 +14,7 @@ from mltrace.db.utils import (
     _load,
     _save,
     _get_view_name,
+    _strict_loading_options,
 )
 from mltrace.db import (
     Component,
@@ -25,9 +28,18 @@ from mltrace.db import (
     output_table,
     feedback_table,
 )
-from mltrace.db.models import component_run_output_association
-from sqlalchemy import func, and_, text
-from sqlalchemy.orm import sessionmaker, joinedload
+from mltrace.db.models import (
+    component_run_output_association,
+    component_run_dependencies,
+)
+from sqlalchemy import event, func, and_, select, text
+from sqlalchemy.orm import (
+    scoped_session,
+    sessionmaker,
+    joinedload,
+    selectinload,
+)
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql.expression import Tuple
 from sqlalchemy.dialects.postgresql import insert
 
@@ -38,20 +50,30 @@ import logging
 import sqlalchemy
 import typing
 
+# Maximum number of memoized component and tag lookups per store
+_CACHE_SIZE = 1024
+
+# Engines by database URI, shared by all stores in the process
+_engine_cache: typing.Dict[str, sqlalchemy.engine.base.Engine] = {}
+
 
 class Store(object):
     """Helper methods to interact with the db."""
 
     def __init__(self, uri: str, delete_first: bool = False):
         """
-        Creates the postgres database for the store. Raises exception if uri
-        isn't prefixed with postgresql://.
+        Creates the postgres database for the store. Raises RuntimeError if
+        uri isn't a string prefixed with postgresql://, before any engine or
+        session is created.
 
         Args:
             uri (str): URI string to connect to the SQLAlchemy database.
             delete_first (bool): Whether all the tables in the db should be
                 deleted.
         """
+        if not isinstance(uri, str):
+            raise RuntimeError("Database URI must be a string.")
+
         if uri.lower().strip() == "test":
             uri = "sqlite:///:memory:"
 
@@ -60,22 +82,88 @@ class Store(object):
                 "Database URI must be prefixed with `postgresql://`"
             )
 
-        self.engine = _create_engine_wrapper(uri)
-
-        # TODO(shreyashankar) remove this line
-        if delete_first:
-            _drop_everything(self.engine)
+        # Reuse the engine (and its connection pool) across stores. In-memory
+        # test databases are not shared, so each test store starts empty.
+        self.engine = _engine_cache.get(uri)
+        created = self.engine is None
+        if created and uri.startswith("postgresql://"):
+            self.engine = _create_engine_wrapper(
+                uri, pool_size=10, max_overflow=20, pool_pre_ping=True
+            )
+        elif created:
+            self.engine = _create_engine_wrapper(uri)
+        initialize = created
 
-        # TODO(shreyashankar) check existing tables against expected tables
-        _initialize_db_tables(self.engine)
+        try:
+            # TODO(shreyashankar) remove this line
+            if delete_first:
+                _drop_everything(self.engine)
+                initialize = True
+
+            # TODO(shreyashankar) check existing tables against expected
+            # tables
+            if initialize:
+                _initialize_db_tables(self.engine)
+        except Exception:
+            # Don't keep a pool around for a DB we could not set up. A cached
+            # engine is shared with other stores, so it is left alone.
+            if created:
+                self.engine.dispose()
+            raise
+
+        # Only share engines whose tables were created
+        if uri.startswith("postgresql://"):
+            _engine_cache[uri] = self.engine
 
         # Initialize session
-        self.Session = sessionmaker(self.engine)
+        self.Session = scoped_session(sessionmaker(bind=self.engine))
         self.session = self.Session()
 
-    def __del__(self):
-        """On destruction, close session."""
-        self.session.close()
+        # Memoize name lookups for the current transaction only
+        self._component_cache = OrderedDict()
+        self._tag_cache = OrderedDict()
+        event.listen(self.session, "after_commit", self._clear_caches)
+        event.listen(self.session, "after_rollback", self._clear_caches)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes session and returns its connection. Session.remove() is
+        thread-local, so this only closes the calling thread's session; the
+        shared engine stays open."""
+        self.Session.remove()
+
+    def _clear_caches(self, session=None):
+        """Drops memoized lookups, which may be stale after the session's
+        transaction ends."""
+        self._component_cache.clear()
+        self._tag_cache.clear()
+
+    def _memoize(self, cache: OrderedDict, key: str, value: typing.Any):
+        """Stores value in the LRU cache, evicting the oldest entry once the
+        cache holds more than _CACHE_SIZE entries."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > _CACHE_SIZE:
+            cache.popitem(last=False)
+
+    @contextmanager
+    def transaction(self):
+        """Commits the session when the block exits, or rolls it back if the
+        block raises. Helpers like create_component, add_tags_to_component,
+        get_io_pointers, and commit_component_run only add to (or flush)
+        the session, so callers using them directly must wrap them in a
+        transaction or commit the session themselves."""
+        try:
+            yield self.session
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
 
     def create_component(
         self,
@@ -85,7 +173,7 @@ class Store(object):
         tags: typing.List[str] = [],
     ):
         """Creates a component entity in the database if it does
-        not already exist."""
+        not already exist. Does not commit."""
         res = self.get_component(name)
 
         if res:
@@ -97,15 +185,20 @@ class Store(object):
             f'Creating new Component with name "{name}", description '
             + f'"{description}", owner "{owner}", and tags "{tags}".'
         )
-        tags = list(set([self.get_tag(t) for t in tags]))
+        tags = self._get_or_create_tags(tags)
         component = Component(
             name=name, description=description, owner=owner, tags=tags
         )
         self.session.add(component)
-        self.session.commit()
+        self._memoize(self._component_cache, name, component)
 
     def get_component(self, name: str) -> Component:
-        """Retrieves component if exists."""
+        """Retrieves component if exists. Lookups, including misses, are
+        memoized until the session's transaction ends."""
+        if name in self._component_cache:
+            self._component_cache.move_to_end(name)
+            return self._component_cache[name]
+
         component = (
             self.session.query(Component)
             .outerjoin(Tag, Component.tags)
@@ -113,6 +206,7 @@ class Store(object):
             .first()
         )
 
+        self._memoize(self._component_cache, name, component)
         return component
 
     def get_component_run(self, id: str) -> ComponentRun:
@@ -128,7 +222,7 @@ class Store(object):
     def add_tags_to_component(
         self, component_name: str, tags: typing.List[str]
     ):
-        """Retreives existing component and adds tags."""
+        """Retreives existing component and adds tags. Does not commit."""
         component = self.get_component(component_name)
 
         if not component:
@@ -136,9 +230,14 @@ class Store(object):
                 f'Component with name "{component_name}" not found.'
             )
 
-        tag_objects = list(set([self.get_tag(t) for t in tags]))
+        # Only resolve tags the component doesn't already have
+        existing = {t.name for t in component.tags}
+        to_add = [t for t in dict.fromkeys(tags) if t not in existing]
+        if len(to_add) == 0:
+            return
+
+        tag_objects = self._get_or_create_tags(to_add)
         component.add_tags(tag_objects)
-        self.session.commit()
 
     def unflag_all(self):
         """Unflags all IO Pointers and commits."""
@@ -162,19 +261,42 @@ class Store(object):
         return component_run
 
     def get_tag(self, name=str) -> Tag:
-        """Creates a tag around the name if it doesn't already exist."""
-        res = self.session.query(Tag).filter(Tag.name == name).all()
-
-        # Must create new Tag
-        if len(res) == 0:
-            logging.info(f'Creating new Tag with name "{name}".')
-            tag = Tag(name)
-            self.session.add(tag)
-            self.session.commit()
-            return tag
+        """Creates a tag around the name if it doesn't already exist. Does
+        not commit."""
+        return self._get_or_create_tags([name])[0]
+
+    def _get_or_create_tags(self, names: typing.List[str]) -> typing.List[Tag]:
+        """Retrieves the tags with the given names in a single query and adds
+        the ones that don't already exist to the session. Returns unique
+        tags in input order."""
+        names = list(dict.fromkeys(names))
+        existing = {
+            name: self._tag_cache[name]
+            for name in names
+            if name in self._tag_cache
+        }
+        need_to_query = [name for name in names if name not in existing]
+
+        if len(need_to_query) != 0:
+            existing.update(
+                {
+                    t.name: t
+                    for t in self.session.query(Tag).filter(
+                        Tag.name.in_(need_to_query)
+                    )
+                }
+            )
+        need_to_add = [name for name in names if name not in existing]
 
-        # Return existing Tag
-        return res[0]
+        if len(need_to_add) != 0:
+            logging.info(f"Creating new Tags with names {need_to_add}.")
+            tags = [Tag(name) for name in need_to_add]
+            existing.update(zip(need_to_add, tags))
+            self.session.add_all(tags)
+
+        for name in names:
+            self._memoize(self._tag_cache, name, existing[name])
+        return [existing[name] for name in names]
 
     def get_io_pointers(
         self,
@@ -182,53 +304,59 @@ class Store(object):
         values: typing.List[typing.Any] = None,
         pointer_type: PointerTypeEnum = None,
         labels: typing.List[str] = None,
+        create=True,
     ) -> typing.List[IOPointer]:
         """Creates io pointers around the specified path names. Retrieves
-        existing io pointer if exists in DB, otherwise creates a new one with
-        inferred pointer type."""
+        existing io pointers from the DB in a single query, and creates the
+        missing ones (with inferred pointer type) in a single batch if the
+        create flag is set. Returns unique io pointers in input order.
+        Does not commit."""
         values = (
             [_hash_value(v) for v in values] if values else [b""] * len(names)
         )
+        # Drop duplicate (name, value) pairs but keep the input order
+        keys = list(dict.fromkeys(zip(names, values)))
+        if len(keys) == 0:
+            return []
+
         res = (
             self.session.query(IOPointer)
-            .filter(
-                Tuple(IOPointer.name, IOPointer.value).in_(
-                    list(zip(names, values))
-                )
-            )
+            .filter(Tuple(IOPointer.name, IOPointer.value).in_(keys))
             .all()
         )
+        existing = {(r.name, bytes(r.value)): r for r in res}
+        need_to_add = [k for k in keys if k not in existing]
+
+        if len(need_to_add) != 0 and create is False:
+            raise RuntimeError(
+                f"IOPointer with name {need_to_add[0][0]} does not exist. "
+                + "Set create flag to True if you would like to create it."
+            )
+
         # Create label vector
         label_vec = self.get_labels(labels) if labels else None
-        if res and labels:
+        if labels:
             for iop in res:
                 iop.add_labels(label_vec)
 
-        res_names_values = set([(r.name, r.value) for r in res])
-        need_to_add = set(zip(names, values)) - res_names_values
-
         if len(need_to_add) != 0:
-            # Create new IOPointers
-            if pointer_type is None:
-                pointer_type = _map_extension_to_enum(
-                    next(iter(need_to_add))[0]
-                )
+            # Create new IOPointers, inferring the type of each one
+            logging.info(f"Creating {len(need_to_add)} new IOPointers.")
             iops = [
                 IOPointer(
                     name=name,
                     value=value,
-                    pointer_type=pointer_type,
+                    pointer_type=pointer_type or _map_extension_to_enum(name),
                 )
                 for name, value in need_to_add
             ]
             if labels:
                 for iop in iops:
                     iop.add_labels(label_vec)
+            existing.update(zip(need_to_add, iops))
             self.session.add_all(iops)
-            self.session.commit()
-            return res + iops
 
-        return res
+        return [existing[k] for k in keys]
 
     def get_io_pointer(
         self,
@@ -257,48 +385,23 @@ class Store(object):
         )
         same_name_res = [r[0] for r in same_name_res]
 
-        # Create label vector
-        label_vec = self.get_labels(labels) if labels else None
-
         if len(same_name_res) > 0 and bytes(same_name_res[0]) != hval:
             logging.warning(
                 f'IOPointer with name "{name}" has a different value '
                 + "from the last write."
             )
 
-        res = (
-            self.session.query(IOPointer)
-            .filter(and_(IOPointer.name == name, IOPointer.value == hval))
-            .all()
-        )
-
-        # Must create new IOPointer
-        if len(res) == 0:
-            if create is False:
-                raise RuntimeError(
-                    f"IOPointer with name {name} noes not exist. Set create"
-                    + f" flag to True if you would like to create it."
-                )
-
-            logging.info(f'Creating new IOPointer with name "{name}".')
-            if pointer_type is None:
-                pointer_type = _map_extension_to_enum(name)
-
-            iop = IOPointer(name=name, value=hval, pointer_type=pointer_type)
-            if labels:
-                iop.add_labels(label_vec)
-            self.session.add(iop)
-            self.session.commit()
-            return iop
-
-        # Return existing object
-        # Add labels if they exist
-        if labels:
-            res[0].add_labels(label_vec)
-        return res[0]
+        return self.get_io_pointers(
+            [name],
+            [value],
+            pointer_type=pointer_type,
+            labels=labels,
+            create=create,
+        )[0]
 
     def delete_component(self, component: Component):
         self.session.delete(component)
+        self._component_cache.pop(component.name, None)
         logging.info(
             f'Successfully deleted Component with name "{component.name}".'
         )
@@ -321,7 +424,8 @@ class Store(object):
         component_run: ComponentRun,
         staleness_threshold: int = (60 * 60 * 24 * 30),
     ):
-        """Commits a fully initialized component run to the DB."""
+        """Adds a fully initialized component run to the DB and flushes it so
+        it gets an id. The enclosing transaction commits it."""
         status_dict = component_run.check_completeness()
         if not status_dict["success"]:
             raise RuntimeError(status_dict["msg"])
@@ -342,20 +446,24 @@ class Store(object):
                     + " days ago."
                 )
             # Second case: there is a newer run of the dependency
-            fresher_runs = self.get_history(
-                dep.component_name,
-                limit=None,
-                date_lower=dep.start_timestamp,
-                date_upper=component_run.start_timestamp,
+            num_fresher_runs = (
+                self.session.query(ComponentRun.id)
+                .filter(ComponentRun.component_name == dep.component_name)
+                .filter(
+                    and_(
+                        ComponentRun.start_timestamp >= dep.start_timestamp,
+                        ComponentRun.start_timestamp
+                        <= component_run.start_timestamp,
+                        ComponentRun.id != component_run.id,
+                    )
+                )
+                .count()
             )
-            fresher_runs = [
-                cr for cr in fresher_runs if component_run.id != cr.id
-            ]
-            if len(fresher_runs) > 1:
-                run_or_runs = "run" if len(fresher_runs) - 1 == 1 else "runs"
+            if num_fresher_runs > 1:
+                run_or_runs = "run" if num_fresher_runs - 1 == 1 else "runs"
                 component_run.add_staleness_message(
                     f"{dep.component_name} (ID {dep.id}) has "
-                    + f"{len(fresher_runs) - 1} fresher {run_or_runs} that "
+                    + f"{num_fresher_runs - 1} fresher {run_or_runs} that "
                     + "began before this component run started."
                 )
 
@@ -369,13 +477,13 @@ class Store(object):
         for out in component_run.outputs:
             out.dedup_labels()
 
-        # Commit to DB
+        # Flush to DB
         self.session.add(component_run)
+        self.session.flush()
         logging.info(
             f"Committing ComponentRun {component_run.id} of type "
             + f'"{component_run.component_name}" to the database.'
         )
-        self.session.commit()
 
     def set_dependencies_from_inputs(self, component_run: ComponentRun):
         """Gets IOPointers associated with component_run's inputs, checks
@@ -387,19 +495,18 @@ class Store(object):
         if len(input_ids) == 0:
             return
 
+        # Most recent producing run per input, resolved in the same query
         match_ids = (
-            self.session.query(
-                func.max(component_run_output_association.c.component_run_id),
+            select(
+                func.max(component_run_output_association.c.component_run_id)
             )
-            .group_by(component_run_output_association.c.output_path_name)
-            .filter(
+            .where(
                 component_run_output_association.c.output_path_name.in_(
                     input_ids
                 )
             )
-            .all()
+            .group_by(component_run_output_association.c.output_path_name)
         )
-        match_ids = [m[0] for m in match_ids]
 
         matches = (
             self.session.query(ComponentRun)
@@ -415,21 +522,124 @@ class Store(object):
         component_run.set_upstream(matches)
 
     def _traverse(
-        self,
-        node: ComponentRun,
-        depth: int,
-        node_list: typing.List[ComponentRun],
-    ):
-        # Add node to node_list as the step
-        node_list.append((depth, node))
+        self, output_ids: typing.List[str]
+    ) -> typing.Dict[str, typing.List[typing.Tuple[int, ComponentRun]]]:
+        """Walks the dependencies of the most recent ComponentRun producing
+        each output id, for all output ids in a single recursive query.
+        Returns dict of output id to list of tuples (depth, ComponentRun)
+        ordered by depth, visiting each ComponentRun once per output id at
+        its shallowest depth. Output ids no run produced are left out.
+        The recursion collects (output id, run) pairs without depths, so
+        UNION drops revisits and cycles stop after every reachable run is
+        seen. Depths then come from a breadth-first walk over the loaded
+        dependencies."""
+        deps = component_run_dependencies
+        outputs = component_run_output_association
+
+        names = (
+            select(IOPointer.name)
+            .where(IOPointer.name.in_(output_ids))
+            .distinct()
+            .subquery()
+        )
+        latest_id = (
+            select(outputs.c.component_run_id)
+            .join(ComponentRun, ComponentRun.id == outputs.c.component_run_id)
+            .where(outputs.c.output_path_name == names.c.name)
+            .order_by(ComponentRun.start_timestamp.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        roots = select(
+            names.c.name.label("root"), latest_id.label("id")
+        ).subquery()
+
+        reachable = (
+            select(roots.c.root, roots.c.id.label("start"), roots.c.id)
+            .where(roots.c.id.isnot(None))
+            .cte("trace", recursive=True)
+        )
+        reachable = reachable.union(
+            select(
+                reachable.c.root,
+                reachable.c.start,
+                deps.c.depends_on_component_run_id.label("id"),
+            )
+            .select_from(reachable)
+            .join(deps, deps.c.component_run_id == reachable.c.id)
+        )
+        rows = (
+            self.session.query(
+                reachable.c.root, reachable.c.start, ComponentRun
+            )
+            .join(ComponentRun, ComponentRun.id == reachable.c.id)
+            .options(
+                selectinload(ComponentRun.inputs),
+                selectinload(ComponentRun.outputs),
+                *_strict_loading_options(),
+            )
+            .all()
+        )
+        self._load_dependencies([node for _, _, node in rows])
+
+        runs, starts = {}, {}
+        for root, start, node in rows:
+            runs.setdefault(root, {})[node.id] = node
+            starts[root] = start
+
+        traces = {}
+        for root, nodes in runs.items():
+            depths = {starts[root]: 0}
+            frontier = [nodes[starts[root]]]
+            while len(frontier) > 0:
+                next_frontier = []
+                for node in frontier:
+                    for dep in node.dependencies:
+                        if dep.id not in depths:
+                            depths[dep.id] = depths[node.id] + 1
+                            next_frontier.append(dep)
+                frontier = next_frontier
+
+            traces[root] = sorted(
+                [(depths[run_id], node) for run_id, node in nodes.items()],
+                key=lambda t: (t[0], t[1].id),
+            )
 
-        # Base case
-        if len(node.dependencies) == 0:
+        return traces
+
+    def _load_dependencies(self, component_runs: typing.List[ComponentRun]):
+        """Populates the dependencies of the given ComponentRuns with a single
+        query, skipping runs whose dependencies are already loaded."""
+        unloaded = {
+            cr.id: cr
+            for cr in component_runs
+            if "dependencies" in sqlalchemy.inspect(cr).unloaded
+        }
+        if len(unloaded) == 0:
             return
 
-        # Recurse on neighbors
-        for neighbor in node.dependencies:
-            self._traverse(neighbor, depth + 1, node_list)
+        edges = (
+            self.session.query(
+                component_run_dependencies.c.component_run_id, ComponentRun
+            )
+            .join(
+                ComponentRun,
+                ComponentRun.id
+                == component_run_dependencies.c.depends_on_component_run_id,
+            )
+            .filter(
+                component_run_dependencies.c.component_run_id.in_(
+                    list(unloaded.keys())
+                )
+            )
+            .all()
+        )
+
+        dependencies = {id: [] for id in unloaded}
+        for id, dep in edges:
+            dependencies[id].append(dep)
+        for id, cr in unloaded.items():
+            set_committed_value(cr, "dependencies", dependencies[id])
 
     def _web_trace_helper(self, component_run_object: ComponentRun):
         """Helper function that populates the dictionary of ComponentRuns for
@@ -472,9 +682,9 @@ class Store(object):
         """Prints list of ComponentRuns to display in the UI."""
         component_run_objects = (
             self.session.query(ComponentRun)
-            .outerjoin(IOPointer, ComponentRun.outputs)
-            .order_by(ComponentRun.start_timestamp.desc())
+            .join(ComponentRun.outputs)
             .filter(IOPointer.name == output_id)
+            .order_by(ComponentRun.start_timestamp.desc())
             .all()
         )
 
@@ -494,23 +704,31 @@ class Store(object):
         if not isinstance(output_id, str):
             raise RuntimeError("Please specify an output id of string type.")
 
-        component_run_object = (
-            self.session.query(ComponentRun)
-            .outerjoin(IOPointer, ComponentRun.outputs)
-            .order_by(ComponentRun.start_timestamp.desc())
-            .filter(IOPointer.name == output_id)
-            .first()
-        )
+        return self.trace_batch([output_id])[output_id]
 
-        if component_run_object is None:
-            raise RuntimeError(f"ID {output_id} does not exist.")
+    def trace_batch(
+        self, output_ids: typing.List[str]
+    ) -> typing.Dict[str, typing.List[typing.Tuple[int, ComponentRun]]]:
+        """Traces several output ids at once. Returns dict of output id to
+        list of tuples (level, ComponentRun), as trace would return for
+        that output id. Issues the same number of queries regardless of how
+        many output ids are given."""
+        if not all(isinstance(output_id, str) for output_id in output_ids):
+            raise RuntimeError("Please specify output ids of string type.")
+
+        output_ids = list(dict.fromkeys(output_ids))
+        if len(output_ids) == 0:
+            return {}
 
-        node_list = []
-        self._traverse(component_run_object, 0, node_list)
-        return node_list
+        traces = self._traverse(output_ids)
 
-    def trace_batch(self, output_ids: typing.List[str]):
-        pass
+        missing = [i for i in output_ids if i not in traces]
+        if len(missing) == 1:
+            raise RuntimeError(f"ID {missing[0]} does not exist.")
+        if len(missing) > 1:
+            raise RuntimeError(f"IDs {missing} do not exist.")
+
+        return {output_id: traces[output_id] for output_id in output_ids}
 
     def get_history(
         self,
@@ -519,7 +737,8 @@ class Store(object):
         date_lower: typing.Union[datetime, str] = datetime.min,
         date_upper: typing.Union[datetime, str] = datetime.max,
     ) -> typing.List[ComponentRun]:
-        """Gets lineage for the component, or a history of all its runs."""
+        """Gets lineage for the component, or a history of all its runs.
+        Eagerly loads the inputs, outputs, and dependencies of each run."""
         history = (
             self.session.query(ComponentRun)
             .filter(ComponentRun.component_name == component_name)
@@ -531,6 +750,12 @@ class Store(object):
             )
             .order_by(ComponentRun.start_timestamp.desc())
             .limit(limit)
+            .options(
+                selectinload(ComponentRun.inputs),
+                selectinload(ComponentRun.outputs),
+                selectinload(ComponentRun.dependencies),
+                *_strict_loading_options(),
+            )
             .all()
         )
 
@@ -567,7 +792,7 @@ class Store(object):
 
     def get_components(self, tag: str = "", owner: str = ""):
         """Returns a list of all the components associated with the specified
-        owner and/or tags."""
+        owner and/or tags, with their tags loaded."""
         if tag and owner:
             components = (
                 self.session.query(Component)
@@ -578,6 +803,9 @@ class Store(object):
                         Component.owner == owner,
                     )
                 )
+                .options(
+                    selectinload(Component.tags), *_strict_loading_options()
+                )
                 .all()
             )
         elif tag:
@@ -585,17 +813,26 @@ class Store(object):
                 self.session.query(Component)
                 .join(Tag, Component.tags)
                 .filter(Tag.name == tag)
+                .options(
+                    selectinload(Component.tags), *_strict_loading_options()
+                )
                 .all()
             )
         elif owner:
             components = (
                 self.session.query(Component)
                 .filter(Component.owner == owner)
-                .options(joinedload("tags"))
+                .options(joinedload("tags"), *_strict_loading_options())
                 .all()
             )
         else:
-            components = self.session.query(Component).all()
+            components = (
+                self.session.query(Component)
+                .options(
+                    selectinload(Component.tags), *_strict_loading_options()
+                )
+                .all()
+            )
 
         if len(components) == 0:
             raise RuntimeError(f"Search yielded no components.")
@@ -700,7 +937,8 @@ class Store(object):
         flagged_output_ids = [iop.name for iop in flagged_iops]
 
         # Perform traces for each output id
-        traces = [self.trace(output_id) for output_id in flagged_output_ids]
+        traces = self.trace_batch(flagged_output_ids)
+        traces = [traces[output_id] for output_id in flagged_output_ids]
         traces = [list(set([node for _, node in trace])) for trace in traces]
 
         # Sort traces by ComponentRun count & id, descending
@@ -792,29 +1030,30 @@ class Store(object):
         return io_pointers
 
     def get_label(self, label_id: str):
-        res = self.session.query(Label).filter(Label.id == label_id).first()
-
-        # If label does not exist, create it
-        if not res:
-            label = Label(id=label_id)
-            self.session.add(label)
-            self.session.commit()
-            return label
-
-        return res
+        """Creates a label with the id if it doesn't already exist. Does not
+        commit."""
+        return self.get_labels([label_id])[0]
 
     def get_labels(self, label_ids: typing.List[str]):
-
-        res = self.session.query(Label).filter(Label.id.in_(label_ids)).all()
-        need_to_add = list(set(label_ids) - set([r.id for r in res]))
+        """Retrieves the labels with the given ids in a single query and adds
+        the ones that don't already exist to the session. Returns unique
+        labels in input order. Does not commit, so the returned objects are
+        not expired and reading them doesn't query the DB again."""
+        label_ids = list(dict.fromkeys(label_ids))
+        existing = {
+            r.id: r
+            for r in self.session.query(Label).filter(
+                Label.id.in_(label_ids)
+            )
+        }
+        need_to_add = [i for i in label_ids if i not in existing]
 
         if len(need_to_add) > 0:
             labels = [Label(id=label_id) for label_id in need_to_add]
+            existing.update(zip(need_to_add, labels))
             self.session.add_all(labels)
-            self.session.commit()
-            return res + labels
 
-        return res
+        return [existing[label_id] for label_id in label_ids]
 
     def assert_not_deleted_labels(
         self,
@@ -854,14 +1093,13 @@ class Store(object):
         self, inputs: typing.List[IOPointer], outputs: typing.List[IOPointer]
     ):
         """
-        Propagates labels from inputs to outputs.
+        Propagates labels from inputs to outputs. Does not commit.
         """
         all_labels = [inp.labels for inp in inputs]
         all_labels = [lab for labels in all_labels for lab in labels]
         for out in outputs:
             out.add_labels(all_labels)
             self.session.add(out)
-        self.session.commit()
 
     def delete_label(self, label_id: str):
         stmt = insert(deleted_labels).values(
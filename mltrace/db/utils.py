@@ -2,6 +2,7 @@ from mltrace.db.base import Base
 from mltrace.db.models import ComponentRun, PointerTypeEnum
 from sqlalchemy import create_engine
 from sqlalchemy.engine.reflection import Inspector
+from sqlalchemy.orm import raiseload
 from sqlalchemy.schema import (
     DropConstraint,
     DropTable,
@@ -24,13 +25,14 @@ import typing
 
 
 def _create_engine_wrapper(
-    uri: str, max_retries=5
+    uri: str, max_retries=5, **kwargs
 ) -> sqlalchemy.engine.base.Engine:
-    """Creates engine using sqlalchemy API. Includes max retries parameter."""
+    """Creates engine using sqlalchemy API. Includes max retries parameter.
+    Extra kwargs (e.g., pool settings) are passed to create_engine."""
     retries = 0
     while retries < max_retries:
         try:
-            engine = create_engine(uri)
+            engine = create_engine(uri, **kwargs)
             return engine
         except Exception as e:
             print(f"DB could not be created with exception {e}. Trying again.")
@@ -38,6 +40,15 @@ def _create_engine_wrapper(
     raise RuntimeError("Max retries hit.")
 
 
+def _strict_loading_options() -> list:
+    """Returns loader options that make unloaded relationships raise instead
+    of lazy loading, if the MLTRACE_STRICT_LOADING env var is set. Read-only
+    queries add these so tests catch accidental N+1 queries."""
+    if os.environ.get("MLTRACE_STRICT_LOADING"):
+        return [raiseload("*")]
+    return []
+
+
 def _initialize_db_tables(engine: sqlalchemy.engine.base.Engine):
     """Initializes tables using sqlalchemy API."""
     Base.metadata.create_all(engine)
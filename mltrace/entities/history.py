@@ -17,36 +17,36 @@ class History(object):
         start_time: datetime = datetime.min,
         end_time: datetime = datetime.max,
     ):
-        store = Store(clientUtils.get_db_uri())
-        history_runs = store.get_history(
-            self.component_name, None, start_time, end_time
-        )
-        history_runs = clientUtils.convertToClient(history_runs)
-        return history_runs
+        with Store(clientUtils.get_db_uri()) as store:
+            history_runs = store.get_history(
+                self.component_name, None, start_time, end_time
+            )
+            history_runs = clientUtils.convertToClient(history_runs)
+            return history_runs
 
     def get_runs_by_index(
         self,
         front_idx: int,
         last_idx: int,
     ):
-        store = Store(clientUtils.get_db_uri())
-        history_runs = store.get_component_runs_by_index(
-            self.component_name, front_idx, last_idx
-        )
-        history_runs = clientUtils.convertToClient(history_runs)
-        return history_runs
+        with Store(clientUtils.get_db_uri()) as store:
+            history_runs = store.get_component_runs_by_index(
+                self.component_name, front_idx, last_idx
+            )
+            history_runs = clientUtils.convertToClient(history_runs)
+            return history_runs
 
     def __getitem__(self, index):
-        store = Store(clientUtils.get_db_uri())
-        history_run = store.get_component_runs_by_index(
-            self.component_name, index, index + 1
-        )
-        history_run = clientUtils.convertToClient(history_run)
-        return history_run
+        with Store(clientUtils.get_db_uri()) as store:
+            history_run = store.get_component_runs_by_index(
+                self.component_name, index, index + 1
+            )
+            history_run = clientUtils.convertToClient(history_run)
+            return history_run
 
     def __len__(self):
-        store = Store(clientUtils.get_db_uri())
-        return store.get_component_runs_count(self.component_name)
+        with Store(clientUtils.get_db_uri()) as store:
+            return store.get_component_runs_count(self.component_name)
 
     def __repr__(self) -> str:
         return f"History({self.component_name})"
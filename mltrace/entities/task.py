@@ -13,6 +13,16 @@ class Task(object):
         self.metrics = []
         # TODO(shreyashankar): Add metric cache
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the task's store session and returns its connection."""
+        self.store.close()
+
     def registerMetric(self, metric: Metric, create_view: bool = True):
         if create_view:
             self.store.create_view(self.task_name, metric.window_size)
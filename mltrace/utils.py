@@ -1,5 +1,6 @@
 from mltrace.db import Store
-from mltrace.entities import IOPointer, ComponentRun
+from mltrace.entities.io_pointer import IOPointer
+from mltrace.entities.component_run import ComponentRun
 
 import copy
 import logging
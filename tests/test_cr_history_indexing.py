@@ -37,6 +37,9 @@ class TestComponentRunHistory(unittest.TestCase):
             self.store.get_component_runs_by_index(
                 "mock_component", 1, 3)
 
+    def tearDown(self):
+        self.store.session.close()
+
     def testPstPstIndex(self):
         """
         Test all possible queries:
@@ -4,12 +4,16 @@ import pytest
 
 from datetime import datetime
 from mltrace.db import Component, ComponentRun, IOPointer, Store
+from tests.utils import record_sqlite_steps, record_statements
 
 
 class TestDags(unittest.TestCase):
     def setUp(self):
         self.store = Store("test")
 
+    def tearDown(self):
+        self.store.session.close()
+
     def testLinkedList(self):
         # Create chain of component runs
         expected_result = []
@@ -108,6 +112,63 @@ class TestDags(unittest.TestCase):
         level_id = [(level, cr.id) for level, cr in trace]
         self.assertEqual(level_id, [(0, 3), (1, 1)])
 
+    def testDiamond(self):
+        # Create diamond of component runs sharing one upstream run
+        iops = [self.store.get_io_pointer(f"iop_{i}") for i in range(1, 5)]
+        io = [([], [iops[0]]), ([iops[0]], [iops[1]])]
+        io += [([iops[0]], [iops[2]]), ([iops[1], iops[2]], [iops[3]])]
+        for i, (inputs, outputs) in enumerate(io, start=1):
+            self.store.create_component(f"mock_component_{i}", "", "")
+            cr = self.store.initialize_empty_component_run(
+                f"mock_component_{i}"
+            )
+            cr.set_start_timestamp()
+            cr.set_end_timestamp()
+            cr.add_inputs(inputs)
+            cr.add_outputs(outputs)
+            self.store.set_dependencies_from_inputs(cr)
+            self.store.commit_component_run(cr)
+
+        # The shared run should only be visited once
+        trace = self.store.trace("iop_4")
+        level_id = sorted([(level, cr.id) for level, cr in trace])
+        self.assertEqual(level_id, [(0, 4), (1, 2), (1, 3), (2, 1)])
+
+    def testTraceBatch(self):
+        # Create runs where x4 and x3 share the upstream run producing x1
+        io = [("x0", "x1"), ("x1", "x2"), ("x1", "x3"), ("x2", "x4")]
+        for i, (inp, out) in enumerate(io, start=1):
+            self.store.create_component(f"mock_component_{i}", "", "")
+            cr = self.store.initialize_empty_component_run(
+                f"mock_component_{i}"
+            )
+            cr.set_start_timestamp()
+            cr.set_end_timestamp()
+            cr.add_input(self.store.get_io_pointer(inp))
+            cr.add_output(self.store.get_io_pointer(out))
+            self.store.set_dependencies_from_inputs(cr)
+            self.store.commit_component_run(cr)
+
+        # Each output id gets its own trace, in input order
+        traces = self.store.trace_batch(["x4", "x3", "x1", "x3"])
+        level_ids = {
+            output_id: [(level, cr.id) for level, cr in trace]
+            for output_id, trace in traces.items()
+        }
+        self.assertEqual(
+            level_ids,
+            {
+                "x4": [(0, 4), (1, 2), (2, 1)],
+                "x3": [(0, 3), (1, 1)],
+                "x1": [(0, 1)],
+            },
+        )
+        self.assertEqual(["x4", "x3", "x1"], list(traces.keys()))
+
+        # Outputs that no run produced are an error
+        with self.assertRaises(RuntimeError):
+            self.store.trace_batch(["x4", "x0"])
+
     def testCycle(self):
         # Create cycle. Since dependencies are versioned, we shouldn't run
         # into problems.
@@ -140,6 +201,92 @@ class TestDags(unittest.TestCase):
         self.assertEqual(trace_1, [(0, 2), (1, 1)])
         self.assertEqual(trace_2, [(0, 1)])
 
+    def testRunCycle(self):
+        # Re-committing a run with a newer upstream creates a cycle of runs
+        runs = []
+        for name, inp, out in [("a", "x0", "x1"), ("b", "x1", "x2")]:
+            self.store.create_component(name, "", "")
+            cr = self.store.initialize_empty_component_run(name)
+            cr.set_start_timestamp()
+            cr.set_end_timestamp()
+            cr.add_input(self.store.get_io_pointer(inp))
+            cr.add_output(self.store.get_io_pointer(out))
+            self.store.set_dependencies_from_inputs(cr)
+            self.store.commit_component_run(cr)
+            runs.append(cr)
+        runs[0].set_upstream(runs[1])
+        self.store.commit_component_run(runs[0])
+
+        # Trace should still terminate, visiting each run once
+        trace = [(level, cr.id) for level, cr in self.store.trace("x2")]
+        self.assertEqual(trace, [(0, 2), (1, 1)])
+
+    def testRunCycleCost(self):
+        # Create a cycle of runs
+        runs = []
+        for name, inp, out in [("a", "x0", "x1"), ("b", "x1", "x2")]:
+            self.store.create_component(name, "", "")
+            cr = self.store.initialize_empty_component_run(name)
+            cr.set_start_timestamp()
+            cr.set_end_timestamp()
+            cr.add_input(self.store.get_io_pointer(inp))
+            cr.add_output(self.store.get_io_pointer(out))
+            self.store.set_dependencies_from_inputs(cr)
+            self.store.commit_component_run(cr)
+            runs.append(cr)
+        runs[0].set_upstream(runs[1])
+        self.store.commit_component_run(runs[0])
+        self.store.session.commit()
+
+        # Measure the recursive query before and after adding unrelated runs
+        costs = []
+        for num_unrelated in [0, 200]:
+            self.store.create_component("unrelated", "", "")
+            for i in range(num_unrelated):
+                cr = self.store.initialize_empty_component_run("unrelated")
+                cr.set_start_timestamp()
+                cr.set_end_timestamp()
+                cr.add_input(self.store.get_io_pointer(f"in_{i}"))
+                cr.add_output(self.store.get_io_pointer(f"out_{i}"))
+                self.store.commit_component_run(cr)
+            self.store.session.commit()
+
+            self.store.session.expire_all()
+            with record_sqlite_steps(self.store.engine) as steps:
+                self.assertEqual(2, len(self.store.trace("x2")))
+            costs += [n for s, n in steps if s.startswith("WITH RECURSIVE")]
+
+        # Walking the cycle costs about as much as the runs it reaches, not
+        # the number of runs in the table
+        self.assertEqual(2, len(costs))
+        self.assertLess(costs[1], 2 * costs[0])
+
+    def testTraceQueryCount(self):
+        # Create chain of component runs
+        for i in range(1, 7):
+            self.store.create_component(f"mock_component_{i}", "", "")
+            cr = self.store.initialize_empty_component_run(
+                f"mock_component_{i}"
+            )
+            cr.set_start_timestamp()
+            cr.set_end_timestamp()
+            cr.add_input(self.store.get_io_pointer(f"iop_{i}"))
+            cr.add_output(self.store.get_io_pointer(f"iop_{i + 1}"))
+            self.store.set_dependencies_from_inputs(cr)
+            self.store.commit_component_run(cr)
+        self.store.session.commit()
+
+        # Short and long traces take the same number of queries
+        counts = []
+        for output_id in ["iop_3", "iop_7"]:
+            self.store.session.expire_all()
+            with record_statements(self.store.engine) as statements:
+                trace = self.store.trace(output_id)
+            counts.append((len(trace), len(statements)))
+        self.assertEqual(counts[0][0], 2)
+        self.assertEqual(counts[1][0], 6)
+        self.assertEqual(counts[0][1], counts[1][1])
+
     def testStaleUpdate(self):
         # Create computation with stale update.
         iop1 = self.store.get_io_pointer("iop1")
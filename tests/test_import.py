@@ -0,0 +1,32 @@
+import subprocess
+import sys
+import unittest
+
+
+class TestImport(unittest.TestCase):
+    def testLazyImport(self):
+        # Run in a fresh interpreter so earlier tests' imports don't count
+        code = "\n".join(
+            [
+                "import sys",
+                "import mltrace",
+                "assert 'sqlalchemy' not in sys.modules",
+                "assert 'mltrace.db' not in sys.modules",
+                "mltrace.get_db_uri",
+                "assert 'sqlalchemy' in sys.modules",
+                "assert 'mltrace.db' in sys.modules",
+            ]
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def testExports(self):
+        import mltrace
+
+        # Every exported name should resolve
+        for name in mltrace.__all__:
+            self.assertTrue(hasattr(mltrace, name), name)
+        self.assertTrue(set(mltrace.__all__) <= set(dir(mltrace)))
+
+
+if __name__ == "__main__":
+    unittest.main()
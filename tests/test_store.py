@@ -1,13 +1,31 @@
 import copy
+import os
 import unittest
 
-from mltrace.db import Component, ComponentRun, IOPointer, Store
+from unittest import mock
+
+from mltrace.db import (
+    Component,
+    ComponentRun,
+    IOPointer,
+    PointerTypeEnum,
+    Store,
+)
+from mltrace.db import store as store_module
+from sqlalchemy.exc import InvalidRequestError
+from tests.utils import record_statements
 
 
 class TestStore(unittest.TestCase):
     def setUp(self):
+        # Raise on lazy loads that read-only queries forgot to eager-load
+        os.environ["MLTRACE_STRICT_LOADING"] = "1"
         self.store = Store("test")
 
+    def tearDown(self):
+        os.environ.pop("MLTRACE_STRICT_LOADING", None)
+        self.store.session.close()
+
     def testComponent(self):
         self.store.create_component(
             "test_component", "test_description", "shreya"
@@ -19,6 +37,99 @@ class TestStore(unittest.TestCase):
         components = self.store.get_components(owner="shreya")
         self.assertEqual(1, len(components))
 
+    def testInvalidUri(self):
+        # Invalid URIs are rejected before an engine is created
+        for uri in ["sqlite:///mltrace.db", None]:
+            with self.assertRaises(RuntimeError):
+                Store(uri)
+
+    def testSharedEngine(self):
+        uri = "postgresql://localhost/mltrace"
+        with mock.patch.dict(
+            store_module._engine_cache, clear=True
+        ), mock.patch.object(
+            store_module, "_create_engine_wrapper"
+        ) as create, mock.patch.object(
+            store_module, "_initialize_db_tables"
+        ):
+            first = Store(uri)
+            second = Store(uri)
+
+            # One engine is created with the pool settings and shared
+            create.assert_called_once_with(
+                uri, pool_size=10, max_overflow=20, pool_pre_ping=True
+            )
+            self.assertIs(first.engine, second.engine)
+
+            # Closing a store removes its session but keeps the engine
+            first.close()
+            self.assertFalse(first.Session.registry.has())
+            first.engine.dispose.assert_not_called()
+            self.assertIs(first.engine, store_module._engine_cache[uri])
+
+    def testFailedSetupDisposal(self):
+        uri = "postgresql://localhost/mltrace"
+        with mock.patch.dict(store_module._engine_cache, clear=True):
+            with mock.patch.object(
+                store_module, "_create_engine_wrapper"
+            ) as create, mock.patch.object(
+                store_module,
+                "_initialize_db_tables",
+                side_effect=RuntimeError,
+            ):
+                # An engine this store created is disposed and not cached
+                with self.assertRaises(RuntimeError):
+                    Store(uri)
+                create.return_value.dispose.assert_called_once()
+                self.assertNotIn(uri, store_module._engine_cache)
+
+            # A cached engine is shared, so a failed setup leaves it alone
+            engine = mock.MagicMock()
+            store_module._engine_cache[uri] = engine
+            with mock.patch.object(
+                store_module, "_drop_everything", side_effect=RuntimeError
+            ):
+                with self.assertRaises(RuntimeError):
+                    Store(uri, delete_first=True)
+            engine.dispose.assert_not_called()
+            self.assertIs(engine, store_module._engine_cache[uri])
+
+    def testComponentLookupCache(self):
+        # Misses and hits are memoized within a transaction
+        self.assertIsNone(self.store.get_component("test_component"))
+        with self.store.transaction():
+            self.store.create_component(
+                "test_component", "test_description", "shreya"
+            )
+            component = self.store.get_component("test_component")
+            self.assertIs(
+                component, self.store.get_component("test_component")
+            )
+
+        # Committing clears the memo
+        self.assertEqual({}, dict(self.store._component_cache))
+        self.assertEqual(
+            "shreya", self.store.get_component("test_component").owner
+        )
+
+    def testTransaction(self):
+        # Work in a successful transaction is committed
+        with self.store.transaction():
+            self.store.create_component(
+                "test_component", "test_description", "shreya"
+            )
+        self.store.session.rollback()
+        self.assertIsNotNone(self.store.get_component("test_component"))
+
+        # Work in a failed transaction is rolled back
+        with self.assertRaises(ValueError):
+            with self.store.transaction():
+                self.store.create_component(
+                    "other_component", "test_description", "shreya"
+                )
+                raise ValueError("Abort transaction.")
+        self.assertIsNone(self.store.get_component("other_component"))
+
     def testCompleteComponentRun(self):
         # Create component
         self.store.create_component(
@@ -54,6 +165,89 @@ class TestStore(unittest.TestCase):
         self.assertEqual(1, len(component_runs))
         self.assertEqual(component_runs[0], cr)
 
+    def testComponentRunIOLinks(self):
+        # Commit component run, then commit it again with an extra input
+        cr = self.store.initialize_empty_component_run("test_component")
+        cr.set_start_timestamp()
+        cr.set_end_timestamp()
+        cr.add_inputs(self.store.get_io_pointers(["inp_1", "inp_2"]))
+        cr.add_output(IOPointer("out"))
+        self.store.commit_component_run(cr)
+        cr.add_input(self.store.get_io_pointer("inp_3"))
+        self.store.commit_component_run(cr)
+
+        # Each I/O should be linked exactly once
+        self.store.session.expire_all()
+        cr = self.store.get_component_run(cr.id)
+        self.assertEqual(
+            ["inp_1", "inp_2", "inp_3"], sorted([i.name for i in cr.inputs])
+        )
+        self.assertEqual(["out"], [o.name for o in cr.outputs])
+
+    def testCommitComponentRunStatements(self):
+        # Commit an upstream run, then log a run that depends on it
+        with self.store.transaction():
+            self.store.create_component("test_component", "", "")
+        for inputs, outputs in [(["inp"], ["mid"]), (["mid", "b"], ["out"])]:
+            with record_statements(self.store.engine) as statements:
+                cr = self.store.initialize_empty_component_run(
+                    "test_component"
+                )
+                cr.set_start_timestamp()
+                cr.set_end_timestamp()
+                cr.add_inputs(self.store.get_io_pointers(inputs))
+                cr.add_outputs(self.store.get_io_pointers(outputs))
+                self.store.set_dependencies_from_inputs(cr)
+                with self.store.transaction():
+                    self.store.commit_component_run(cr)
+
+        # The run is inserted once and linked with one insert per table
+        writes = [
+            s.split("(")[0].strip()
+            for s in statements
+            if not s.startswith("SELECT") and "component_run" in s
+        ]
+        self.assertEqual(
+            sorted(writes),
+            [
+                "INSERT INTO component_run_dependencies",
+                "INSERT INTO component_runs",
+                "INSERT INTO component_runs_inputs",
+                "INSERT INTO component_runs_outputs",
+            ],
+        )
+
+        # The rows are linked as expected
+        self.store.session.expire_all()
+        component_runs = self.store.get_history("test_component", limit=None)
+        io = [
+            (
+                cr.id,
+                sorted([i.name for i in cr.inputs]),
+                [o.name for o in cr.outputs],
+                [d.id for d in cr.dependencies],
+            )
+            for cr in component_runs
+        ]
+        self.assertEqual(
+            io, [(2, ["b", "mid"], ["out"], [1]), (1, ["inp"], ["mid"], [])]
+        )
+
+    def testStrictLoading(self):
+        # Create and commit component run
+        cr = self.store.initialize_empty_component_run("test_component")
+        cr.set_start_timestamp()
+        cr.set_end_timestamp()
+        cr.add_output(IOPointer("out"))
+        with self.store.transaction():
+            self.store.commit_component_run(cr)
+
+        # Eagerly loaded relationships work, others raise
+        component_runs = self.store.get_history("test_component", limit=None)
+        self.assertEqual(["out"], [o.name for o in component_runs[0].outputs])
+        with self.assertRaises(InvalidRequestError):
+            component_runs[0].left_component_run_ids
+
     def testIncompleteComponentRun(self):
         # Create component
         self.store.create_component(
@@ -95,6 +289,72 @@ class TestStore(unittest.TestCase):
         self.assertEqual(component.name, "test_component")
         self.assertEqual(tags, ["tag1"])
 
+    def testTagsSkipExisting(self):
+        # Create and commit component with a tag
+        self.store.create_component(
+            "test_component", "test_description", "shreya", ["tag1"]
+        )
+        self.store.session.commit()
+
+        # Adding tags the component already has is a no-op
+        self.store.add_tags_to_component("test_component", ["tag1"])
+        self.assertEqual(0, len(self.store.session.dirty))
+        self.assertEqual(0, len(self.store.session.new))
+
+    def testGetTag(self):
+        # Repeated lookups before a commit should not create duplicates
+        tag = self.store.get_tag("tag1")
+        self.assertIs(tag, self.store.get_tag("tag1"))
+        self.store.session.commit()
+
+        self.assertEqual(tag, self.store.get_tag("tag1"))
+        self.assertEqual(["tag1"], [t.name for t in self.store.get_tags()])
+
+    def testSharedTags(self):
+        # Create components whose tags partially overlap
+        self.store.create_component(
+            "test_component", "test_description", "shreya", ["a", "b", "a"]
+        )
+        self.store.create_component(
+            "other_component", "test_description", "shreya", ["b"]
+        )
+        self.store.add_tags_to_component("other_component", ["b", "c"])
+
+        # Existing tags should be reused rather than created again
+        tags = [t.name for t in self.store.get_tags()]
+        self.assertEqual(sorted(tags), ["a", "b", "c"])
+        component = self.store.get_component("other_component")
+        self.assertEqual(sorted([t.name for t in component.tags]), ["b", "c"])
+
+    def testGetLabels(self):
+        # Labels come back unique and in order, and are only created once
+        with self.store.transaction():
+            labels = self.store.get_labels(["b", "a", "b"])
+            self.assertEqual(["b", "a"], [label.id for label in labels])
+            self.assertIs(labels[1], self.store.get_label("a"))
+
+        labels = self.store.get_labels(["a", "c"])
+        self.assertEqual(["a", "c"], [label.id for label in labels])
+        self.store.session.commit()
+        self.assertEqual(
+            ["a", "b", "c"],
+            sorted([label.id for label in self.store.get_all_labels()]),
+        )
+
+    def testPropagateLabels(self):
+        # Labels are propagated within the caller's transaction
+        with self.store.transaction():
+            inp = self.store.get_io_pointer("inp", labels=["label"])
+            out = self.store.get_io_pointer("out")
+        self.store.propagate_labels([inp], [out])
+        self.store.session.rollback()
+        self.assertEqual([], self.store.get_io_pointer("out").labels)
+
+        with self.store.transaction():
+            self.store.propagate_labels([inp], [out])
+        labels = self.store.get_io_pointer("out").labels
+        self.assertEqual(["label"], [label.id for label in labels])
+
     def testIOPointer(self):
         # Test there is no IOPointer
         with self.assertRaises(RuntimeError):
@@ -114,6 +374,25 @@ class TestStore(unittest.TestCase):
 
         self.assertEqual(set(iops), set(iops2))
 
+    def testIOPointersOrderAndType(self):
+        # Partially existing, duplicated names come back once, in order
+        self.store.get_io_pointer("model.pkl")
+        iops = self.store.get_io_pointers(
+            ["data.csv", "model.pkl", "data.csv", "other"]
+        )
+
+        self.assertEqual(
+            [iop.name for iop in iops], ["data.csv", "model.pkl", "other"]
+        )
+        self.assertEqual(
+            [iop.pointer_type for iop in iops],
+            [
+                PointerTypeEnum.DATA,
+                PointerTypeEnum.MODEL,
+                PointerTypeEnum.UNKNOWN,
+            ],
+        )
+
     def testKVIOPointer(self):
         iop_name = "name"
         iop_value = "value"
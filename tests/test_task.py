@@ -12,6 +12,13 @@ class TestTask(unittest.TestCase):
         res = task.getOutputs()
         self.assertTrue(float(res[0][2]) == 1.0)
 
+    def testCloseOnExit(self):
+        with Task("test_close") as task:
+            task.logOutput(1, "ABC")
+
+        # Leaving the block closes the task's session
+        self.assertFalse(task.store.Session.registry.has())
+
     def testLogFeedback(self):
         task = Task("test_feedback")
         task.logFeedback(1, "ABC")
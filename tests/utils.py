@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+@contextmanager
+def record_statements(engine):
+    """Yields a list that collects the SQL of every statement the engine
+    executes inside the block."""
+    statements = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def record_sqlite_steps(engine):
+    """Yields a list that collects a [statement, steps] pair for every
+    statement a SQLite engine executes inside the block, where steps counts
+    (in tens) the virtual machine instructions spent executing and fetching
+    it."""
+    steps = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        steps.append([statement, 0])
+
+    def progress_handler():
+        if len(steps) > 0:
+            steps[-1][1] += 1
+        return 0
+
+    connection = engine.raw_connection()
+    connection.dbapi_connection.set_progress_handler(progress_handler, 10)
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield steps
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        connection.dbapi_connection.set_progress_handler(None, 10)
+        connection.close()